@@ -3,11 +3,15 @@ from __future__ import annotations
 import asyncio
 import logging
 from asyncio import Queue
+from collections import Counter
 from datetime import datetime
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple
 
 import aiohttp
+import orjson
 from chia.rpc.farmer_rpc_client import FarmerRpcClient
 from chia.rpc.full_node_rpc_client import FullNodeRpcClient
 from chia.rpc.harvester_rpc_client import HarvesterRpcClient
@@ -20,52 +24,103 @@ from monitor.collectors.collector import Collector
 from monitor.events import (BlockchainStateEvent, ChiaEvent, ConnectionsEvent,
                             HarvesterPlotsEvent, WalletBalanceEvent)
 
+LOOPBACK_HOSTS = ("127.0.0.1", "::1")
+HARVESTER_TYPE = NodeType.HARVESTER.value
+# Keep unresponsive remote harvesters from stalling the 10 second polling tick
+HARVESTER_TIMEOUT_SECONDS = 5
+
+
+class OrjsonHarvesterRpcClient(HarvesterRpcClient):
+    # Plot listings can be tens of MB on large farms, so decode them with orjson.
+    # Mirrors RpcClient.fetch of chia 1.1.7 (pinned in the Pipfile) apart from the decoder;
+    # re-check it whenever that pin is bumped.
+    async def fetch(self, path, request_json) -> Any:
+        async with self.session.post(self.url + path, json=request_json,
+                                     ssl_context=self.ssl_context) as response:
+            response.raise_for_status()
+            res_json = await response.json(loads=orjson.loads)
+            if not res_json["success"]:
+                raise ValueError(res_json)
+            return res_json
+
 
 class RpcCollector(Collector):
     full_node_client: FullNodeRpcClient
     wallet_client: WalletRpcClient
-    harvester_client: HarvesterRpcClient
+    harvester_client: OrjsonHarvesterRpcClient
     farmer_client: FarmerRpcClient
+    self_hostname: str
+    root_path: Path
+    net_config: Dict
+    harvester_rpc_port: int
+    _harvester_clients: Dict[Tuple[str, int], OrjsonHarvesterRpcClient]
+    _last_plots_sig: Optional[Tuple[int, int]]
+    _last_state_sig: Optional[Tuple[int, str, bool]]
 
     @staticmethod
     async def create(root_path: Path, net_config: Dict, event_queue: Queue[ChiaEvent]) -> RpcCollector:
         self = RpcCollector()
         self.log = logging.getLogger(__name__)
         self.event_queue = event_queue
+        self.root_path = root_path
+        self.net_config = net_config
+        self._harvester_clients = {}
+        self._last_plots_sig = None
+        self._last_state_sig = None
 
         self_hostname = net_config["self_hostname"]
+        self.self_hostname = self_hostname
         full_node_rpc_port = net_config["full_node"]["rpc_port"]
         wallet_rpc_port = net_config["wallet"]["rpc_port"]
         harvester_rpc_port = net_config["harvester"]["rpc_port"]
         farmer_rpc_port = net_config["farmer"]["rpc_port"]
+        self.harvester_rpc_port = harvester_rpc_port
 
         self.full_node_client = await FullNodeRpcClient.create(self_hostname, uint16(full_node_rpc_port),
                                                                root_path, net_config)
         self.wallet_client = await WalletRpcClient.create(self_hostname, uint16(wallet_rpc_port),
                                                           root_path, net_config)
-        self.harvester_client = await HarvesterRpcClient.create(self_hostname,
-                                                                uint16(harvester_rpc_port), root_path,
-                                                                net_config)
+        self.harvester_client = await OrjsonHarvesterRpcClient.create(self_hostname,
+                                                                      uint16(harvester_rpc_port),
+                                                                      root_path, net_config)
         self.farmer_client = await FarmerRpcClient.create(self_hostname, uint16(farmer_rpc_port),
                                                           root_path, net_config)
         return self
 
-    async def get_wallet_balance(self) -> None:
+    async def get_wallet_balance(self, ts: datetime) -> None:
         try:
-            wallets = await self.wallet_client.get_wallets()
-            confirmed_balances = []
-            for wallet in wallets:
-                balance = await self.wallet_client.get_wallet_balance(wallet["id"])
-                confirmed_balances.append(balance["confirmed_wallet_balance"])
-        except:
-            raise ConnectionError("Failed to get wallet balance via RPC. Is your wallet running?")
-        event = WalletBalanceEvent(ts=datetime.now(), confirmed=str(sum(confirmed_balances)))
+            wallet_ids = [wallet["id"] for wallet in await self.wallet_client.get_wallets()]
+            balances = await asyncio.gather(
+                *(self.wallet_client.get_wallet_balance(wallet_id) for wallet_id in wallet_ids))
+            confirmed_balance = sum(int(balance["confirmed_wallet_balance"]) for balance in balances)
+        except (aiohttp.ClientError, OSError, KeyError, ValueError) as e:
+            raise ConnectionError("Failed to get wallet balance via RPC. Is your wallet running?") from e
+        event = WalletBalanceEvent(ts=ts, confirmed=str(confirmed_balance))
         await self.publish_event(event)
 
-    async def get_plots(self) -> Optional[Dict[str, Any]]:
+    async def get_harvester_client(self, host: str) -> OrjsonHarvesterRpcClient:
+        if host == self.self_hostname or host in LOOPBACK_HOSTS:
+            return self.harvester_client
+        key = (host, self.harvester_rpc_port)
+        client = self._harvester_clients.get(key)
+        if client is None:
+            client = await OrjsonHarvesterRpcClient.create(host, uint16(self.harvester_rpc_port),
+                                                           self.root_path, self.net_config)
+            self._harvester_clients[key] = client
+        return client
+
+    async def get_plots(self, host: str) -> Optional[Dict[str, Any]]:
         plots = None
         try:
-            plots = await self.harvester_client.get_plots()
+            harvester_client = await self.get_harvester_client(host)
+            if harvester_client is self.harvester_client:
+                # Large local farms can legitimately take longer than the remote timeout
+                plots = await harvester_client.get_plots()
+            else:
+                plots = await asyncio.wait_for(harvester_client.get_plots(),
+                                               timeout=HARVESTER_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            self.log.warning(f"Timed out getting plots from harvester '{host}'")
         except Exception as e:
             if isinstance(e, aiohttp.ClientConnectorError):
                 print(
@@ -76,68 +131,74 @@ class RpcCollector(Collector):
         return plots
 
     async def get_all_plots(self, harvester_hosts: List[str]) -> Optional[Dict[str, Any]]:
-        all_plots = None
-        for host in harvester_hosts:
-            plots = await self.get_plots()
-            if plots is not None and plots["success"]:
-                if all_plots is None:
-                    all_plots = plots
-                else:
-                    all_plots["plots"] += plots["plots"]
-        return all_plots
+        results = await asyncio.gather(*(self.get_plots(host) for host in harvester_hosts))
+        plot_lists = [plots["plots"] for plots in results if plots is not None and plots["success"]]
+        if not plot_lists:
+            return None
+        return {"success": True, "plots": list(chain.from_iterable(plot_lists))}
 
     async def get_harvesters(self) -> List[str]:
         harvester_hosts = []
         try:
             connections = await self.farmer_client.get_connections()
-            for c in connections:
-                if c["type"] == NodeType.HARVESTER:
-                    harvester_hosts.append(c["peer_host"])
+            harvester_hosts = [c["peer_host"] for c in connections if c["type"] == HARVESTER_TYPE]
         except Exception as e:
             print(f"Exception from 'farmer' {e}")
 
         return harvester_hosts
 
-    async def get_harvester_plots(self) -> None:
-        try:
-            # plots = await self.harvester_client.get_plots()
-            harvesters = await self.get_harvesters()
-            plots = await self.get_all_plots(harvesters)
-        except:
+    async def get_harvester_plots(self, ts: datetime) -> None:
+        # get_harvesters and get_plots log and swallow their own errors, so a missing result is
+        # the only failure that reaches this point
+        harvesters = await self.get_harvesters()
+        plots = await self.get_all_plots(harvesters)
+        if plots is None:
             raise ConnectionError("Failed to get harvester plots via RPC. Is your harvester running?")
-        event = HarvesterPlotsEvent(ts=datetime.now(),
-                                    plot_count=len(plots["plots"]),
-                                    plot_size=sum(plot["file_size"] for plot in plots["plots"]))
+        plot_count = len(plots["plots"])
+        plot_size = sum(map(itemgetter("file_size"), plots["plots"]))
+        plots_sig = (plot_count, plot_size)
+        if plots_sig == self._last_plots_sig:
+            return
+        self._last_plots_sig = plots_sig
+        event = HarvesterPlotsEvent(ts=ts, plot_count=plot_count, plot_size=plot_size)
         await self.publish_event(event)
 
-    async def get_blockchain_state(self) -> None:
+    async def get_blockchain_state(self, ts: datetime) -> None:
         try:
             state = await self.full_node_client.get_blockchain_state()
-        except:
-            raise ConnectionError("Failed to get blockchain state via RPC. Is your full node running?")
-        event = BlockchainStateEvent(ts=datetime.now(),
+        except (aiohttp.ClientError, OSError, KeyError, ValueError) as e:
+            raise ConnectionError(
+                "Failed to get blockchain state via RPC. Is your full node running?") from e
+        state_sig = (state["difficulty"], str(state["peak"].height), state["sync"]["synced"])
+        if state_sig == self._last_state_sig:
+            return
+        self._last_state_sig = state_sig
+        event = BlockchainStateEvent(ts=ts,
                                      space=str(state["space"]),
                                      diffculty=state["difficulty"],
                                      peak_height=str(state["peak"].height),
                                      synced=state["sync"]["synced"])
         await self.publish_event(event)
 
-    async def get_connections(self) -> None:
+    async def get_connections(self, ts: datetime) -> None:
         peers = await self.full_node_client.get_connections()
-        full_node_connections = [peer for peer in peers if NodeType(peer["type"]) == NodeType.FULL_NODE]
-        farmer_connections = [peer for peer in peers if NodeType(peer["type"]) == NodeType.FARMER]
-        wallet_connections = [peer for peer in peers if NodeType(peer["type"]) == NodeType.WALLET]
-        event = ConnectionsEvent(ts=datetime.now(),
-                                 full_node_count=len(full_node_connections),
-                                 farmer_count=len(farmer_connections),
-                                 wallet_count=len(wallet_connections))
+        peer_counts = Counter(peer["type"] for peer in peers)
+        event = ConnectionsEvent(ts=ts,
+                                 full_node_count=peer_counts[NodeType.FULL_NODE.value],
+                                 farmer_count=peer_counts[NodeType.FARMER.value],
+                                 wallet_count=peer_counts[NodeType.WALLET.value])
         await self.publish_event(event)
 
     async def task(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         while True:
-            await asyncio.gather(self.get_wallet_balance(), self.get_harvester_plots(),
-                                 self.get_blockchain_state(), self.get_connections())
-            await asyncio.sleep(10)
+            ts = datetime.now()
+            await asyncio.gather(self.get_wallet_balance(ts), self.get_harvester_plots(ts),
+                                 self.get_blockchain_state(ts), self.get_connections(ts))
+            # Skip ticks missed by a slow poll instead of replaying them back-to-back
+            next_tick = max(next_tick + 10, loop.time())
+            await asyncio.sleep(max(0, next_tick - loop.time()))
 
     @staticmethod
     async def close_rpc_client(rpc_client: RpcClient) -> None:
@@ -145,7 +206,10 @@ class RpcCollector(Collector):
         await rpc_client.await_closed()
 
     async def close(self) -> None:
-        await RpcCollector.close_rpc_client(self.full_node_client)
-        await RpcCollector.close_rpc_client(self.wallet_client)
-        await RpcCollector.close_rpc_client(self.harvester_client)
-        await RpcCollector.close_rpc_client(self.farmer_client)
+        await asyncio.gather(
+            RpcCollector.close_rpc_client(self.full_node_client),
+            RpcCollector.close_rpc_client(self.wallet_client),
+            RpcCollector.close_rpc_client(self.harvester_client),
+            RpcCollector.close_rpc_client(self.farmer_client),
+            *(RpcCollector.close_rpc_client(client) for client in self._harvester_clients.values()),
+        )
@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta
 
 from monitor.db import async_session
@@ -9,61 +10,59 @@ from sqlalchemy import select
 from sqlalchemy.sql import func
 from apprise import Apprise
 
+_LATEST_PLOTS = select(HarvesterPlotsEvent).order_by(HarvesterPlotsEvent.ts.desc()).limit(1)
+_LATEST_STATE = select(BlockchainStateEvent).order_by(BlockchainStateEvent.ts.desc()).limit(1)
+_LATEST_BALANCE = select(WalletBalanceEvent).order_by(WalletBalanceEvent.ts.desc()).limit(1)
+_LATEST_CONNECTIONS = select(ConnectionsEvent).order_by(ConnectionsEvent.ts.desc()).limit(1)
+_SUM_PROOFS = select(func.sum(FarmingInfoEvent.proofs))
+_FARMING_START = select(func.min(FarmingInfoEvent.ts))
+
 
 class SummaryNotification(Notification):
     summary_interval: timedelta
     startup_delay: timedelta
-    last_summary_ts: datetime
+    next_summary_deadline: float
 
     def __init__(self, apobj: Apprise, summary_interval_minutes: int) -> None:
         super().__init__(apobj)
         self.startup_delay = timedelta(seconds=30)
         self.summary_interval = timedelta(minutes=summary_interval_minutes)
-        self.last_summary_ts: datetime = datetime.now() - self.summary_interval + self.startup_delay
+        self.next_summary_deadline = time.monotonic() + self.startup_delay.total_seconds()
 
     async def condition(self) -> bool:
-        if datetime.now() - self.last_summary_ts > self.summary_interval:
-            return True
-        else:
-            return False
+        return time.monotonic() >= self.next_summary_deadline
 
     async def trigger(self) -> None:
+        now = datetime.now()
         async with async_session() as db_session:
-            result = await db_session.execute(
-                select(HarvesterPlotsEvent).order_by(HarvesterPlotsEvent.ts.desc()).limit(1))
+            result = await db_session.execute(_LATEST_PLOTS)
             last_plots: HarvesterPlotsEvent = result.scalars().first()
 
-            result = await db_session.execute(
-                select(BlockchainStateEvent).order_by(BlockchainStateEvent.ts.desc()).limit(1))
+            result = await db_session.execute(_LATEST_STATE)
             last_state: BlockchainStateEvent = result.scalars().first()
 
-            result = await db_session.execute(
-                select(WalletBalanceEvent).order_by(WalletBalanceEvent.ts.desc()).limit(1))
+            result = await db_session.execute(_LATEST_BALANCE)
             last_balance: WalletBalanceEvent = result.scalars().first()
 
-            result = await db_session.execute(
-                select(ConnectionsEvent).order_by(ConnectionsEvent.ts.desc()).limit(1))
+            result = await db_session.execute(_LATEST_CONNECTIONS)
             last_connections: ConnectionsEvent = result.scalars().first()
 
-            result = await db_session.execute(select(func.sum(FarmingInfoEvent.proofs)))
-            proofs_found: int = result.scalars().first()
-
+            # Fetch all farming aggregates in a single round trip
+            avg_passed_filter = select(func.avg(FarmingInfoEvent.passed_filter)).where(
+                FarmingInfoEvent.ts >= now - self.summary_interval)
             result = await db_session.execute(
-                select(func.avg(FarmingInfoEvent.passed_filter)).where(
-                    FarmingInfoEvent.ts >= datetime.now() - self.summary_interval))
-            avg_passed_filters: float = result.scalars().first()
-
-            result = await db_session.execute(select(func.min(FarmingInfoEvent.ts)))
-            farming_start: datetime = result.scalars().first()
+                select(_SUM_PROOFS.scalar_subquery(), avg_passed_filter.scalar_subquery(),
+                       _FARMING_START.scalar_subquery()))
+            proofs_found, avg_passed_filters, farming_start = result.one()
 
             avg_challenges_per_min = None
             if farming_start is not None:
-                farming_since: timedelta = datetime.now() - farming_start
+                farming_since: timedelta = now - farming_start
                 interval_secs = min(farming_since.seconds, self.summary_interval.seconds)
                 if interval_secs > 0:
                     result = await db_session.execute(
                         select(func.count(SignagePointEvent.ts)).where(
-                            SignagePointEvent.ts >= datetime.now() - self.summary_interval))
+                            SignagePointEvent.ts >= now - self.summary_interval))
                     num_signage_points = result.scalars().first()
                     avg_challenges_per_min: float = num_signage_points / (interval_secs / 60)
 
@@ -84,7 +83,7 @@ class SummaryNotification(Notification):
             ])
             sent = self.apobj.notify(title='** 👨‍🌾 Farm Status 👩‍🌾 **', body=summary)
             if sent:
-                self.last_summary_ts = datetime.now()
+                self.next_summary_deadline = time.monotonic() + self.summary_interval.total_seconds()
                 return True
 
         return False